@@ -0,0 +1,100 @@
+from fractions import Fraction
+
+TOLERANCE = 0.005  # largest difference still scored as a match
+
+def normalize_answer(answer: str) -> str:
+    """Normalize answers for comparison"""
+    answer = answer.strip().lower()
+    
+    # Try to parse as fraction
+    if '/' in answer:
+        try:
+            frac = Fraction(answer)
+            return f"{frac.numerator}/{frac.denominator}"
+        except:
+            pass
+    
+    # Try to parse as decimal
+    try:
+        decimal_val = float(answer)
+        return f"{decimal_val:.3f}"
+    except:
+        pass
+    
+    return answer
+
+def answers_match(model_answer: str, expected_answer: str) -> bool:
+    """Check if model answer matches expected answer"""
+    model_norm = normalize_answer(model_answer)
+    expected_norm = normalize_answer(expected_answer)
+    
+    # Direct match
+    if model_norm == expected_norm:
+        return True
+    
+    # Try fraction to decimal comparison
+    try:
+        if '/' in expected_answer:
+            expected_decimal = float(Fraction(expected_answer))
+        else:
+            expected_decimal = float(expected_answer)
+        
+        if '/' in model_answer:
+            model_decimal = float(Fraction(model_answer))
+        else:
+            model_decimal = float(model_answer)
+        
+        # Check if they're close (within TOLERANCE)
+        return abs(model_decimal - expected_decimal) < TOLERANCE
+    except:
+        return False
+
+def is_numeric_answer(answer: str) -> bool:
+    """Check if an answer is a plain fraction, decimal or integer"""
+    try:
+        Fraction(answer.strip())
+        return True
+    except (ValueError, ZeroDivisionError):
+        return False
+
+def match_answers(pairs) -> list:
+    """Score (model_answer, expected_answer) pairs, used by both inference and evaluation.
+
+    Numeric answers use answers_match. Pairs it rejects where either side is an
+    expression (derivatives, integrals, pi/4, ...) go to the symbolic checker.
+    Returns True, False, or None when the symbolic check timed out.
+    """
+    matches = []
+    symbolic_pending = []
+    for i, (model_ans, expected_ans) in enumerate(pairs):
+        model_ans, expected_ans = str(model_ans), str(expected_ans)
+        if answers_match(model_ans, expected_ans):
+            matches.append(True)
+        else:
+            matches.append(False)
+            if model_ans.strip() and not (is_numeric_answer(model_ans) and is_numeric_answer(expected_ans)):
+                symbolic_pending.append((i, model_ans, expected_ans))
+
+    if symbolic_pending:
+        # Only needed for expression answers, so SymPy is imported lazily
+        try:
+            from symbolic_matching import check_answers
+        except ImportError:
+            # A numeric dataset can still be scored: a non-numeric model answer is wrong
+            if all(is_numeric_answer(expected_ans) for _, _, expected_ans in symbolic_pending):
+                return matches
+            raise
+        checked = check_answers([(model_ans, expected_ans) for _, model_ans, expected_ans in symbolic_pending])
+        for (i, _, _), matched in zip(symbolic_pending, checked):
+            matches[i] = matched
+    return matches
+
+def start_symbolic_checker(expected_answers, workers: int = None):
+    """Start the symbolic checker's worker pool if any expected answer is an expression.
+
+    Call this before starting threads or making network requests, forking after that is unsafe.
+    """
+    if all(is_numeric_answer(str(answer)) for answer in expected_answers):
+        return
+    from symbolic_matching import start_pool
+    start_pool(workers)
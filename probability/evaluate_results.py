@@ -1,53 +1,6 @@
 import json
 import pandas as pd
-from fractions import Fraction
-
-def normalize_answer(answer: str) -> str:
-    """Normalize answers for comparison"""
-    answer = answer.strip().lower()
-    
-    # Try to parse as fraction
-    if '/' in answer:
-        try:
-            frac = Fraction(answer)
-            return f"{frac.numerator}/{frac.denominator}"
-        except:
-            pass
-    
-    # Try to parse as decimal
-    try:
-        decimal_val = float(answer)
-        return f"{decimal_val:.3f}"
-    except:
-        pass
-    
-    return answer
-
-def answers_match(model_answer: str, expected_answer: str) -> bool:
-    """Check if model answer matches expected answer"""
-    model_norm = normalize_answer(model_answer)
-    expected_norm = normalize_answer(expected_answer)
-    
-    # Direct match
-    if model_norm == expected_norm:
-        return True
-    
-    # Try fraction to decimal comparison
-    try:
-        if '/' in expected_answer:
-            expected_decimal = float(Fraction(expected_answer))
-        else:
-            expected_decimal = float(expected_answer)
-        
-        if '/' in model_answer:
-            model_decimal = float(Fraction(model_answer))
-        else:
-            model_decimal = float(model_answer)
-        
-        # Check if they're close (within 0.005)
-        return abs(model_decimal - expected_decimal) < 0.005
-    except:
-        return False
+from answer_matching import match_answers
 
 # Change the filename here
 with open("results_gemma3_4b.json", "r", encoding="utf-8") as f:
@@ -58,15 +11,19 @@ correct = 0
 errors = 0
 incorrect_details = []
 
+scored = []
 for result in results:
-    model_ans = result.get("model_response", "")
-    expected_ans = result.get("expected_answer", "")
-    
     if "ERROR" in result.get("model_response_raw", ""):
         errors += 1
         continue
-    
-    if answers_match(model_ans, expected_ans):
+    scored.append(result)
+
+# Expression answers (derivatives, integrals, ...) are checked symbolically in a process pool
+matches = match_answers([(r.get("model_response", ""), r.get("expected_answer", "")) for r in scored])
+symbolic_timeouts = sum(1 for matched in matches if matched is None)
+
+for result, matched in zip(scored, matches):
+    if matched:
         correct += 1
         result["is_correct"] = True
     else:
@@ -74,8 +31,8 @@ for result in results:
         incorrect_details.append({
             "problem_id": result["problem_id"],
             "input": result["input"],
-            "expected": expected_ans,
-            "got": model_ans
+            "expected": result.get("expected_answer", ""),
+            "got": result.get("model_response", "")
         })
 
 accuracy = (correct / total) * 100 if total > 0 else 0
@@ -91,6 +48,8 @@ print(f"Total Questions: {total}")
 print(f"Correct Answers: {correct}")
 print(f"Incorrect Answers: {total - correct - errors}")
 print(f"Errors: {errors}")
+if symbolic_timeouts:
+    print(f"Symbolic Checks Timed Out: {symbolic_timeouts}")
 print(f"\nAccuracy: {accuracy:.2f}%")
 print(f"Error Rate: {error_rate:.2f}%")
 print(f"Average Latency: {avg_latency:.3f} seconds")
@@ -139,6 +98,7 @@ evaluation_report = {
     "correct": correct,
     "incorrect": total - correct - errors,
     "errors": errors,
+    "symbolic_timeouts": symbolic_timeouts,
     "accuracy_percent": round(accuracy, 2),
     "error_rate_percent": round(error_rate, 2),
     "avg_latency_sec": round(avg_latency, 3),
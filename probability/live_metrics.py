@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class RunMetrics:
+    """Thread-safe counters for a single inference run"""
+
+    def __init__(self, model: str, total_rows: int):
+        self.model = model
+        self.total_rows = total_rows
+        self.started_at = time.time()
+        self.last_row_at = None
+        self.completed = 0
+        self.correct = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, is_correct: bool, is_error: bool):
+        """Record one finished row"""
+        with self._lock:
+            self.completed += 1
+            self.last_row_at = time.time()
+            self.latency_sum += latency
+            if is_error:
+                self.errors += 1
+            elif is_correct:
+                self.correct += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    self.bucket_counts[i] += 1
+
+    def accuracy(self) -> float:
+        return (self.correct / self.completed) * 100 if self.completed > 0 else 0
+
+    def eta_seconds(self) -> float:
+        """Estimated time left, based on the average wall time per row so far"""
+        if self.completed == 0:
+            return 0
+        per_row = ((self.last_row_at or time.time()) - self.started_at) / self.completed
+        return per_row * (self.total_rows - self.completed)
+
+    def render(self) -> str:
+        """Render the current state in Prometheus text exposition format"""
+        with self._lock:
+            label = f'model="{self.model}"'
+            lines = [
+                "# HELP llm_eval_dataset_rows Rows in the dataset",
+                "# TYPE llm_eval_dataset_rows gauge",
+                f"llm_eval_dataset_rows{{{label}}} {self.total_rows}",
+                "# HELP llm_eval_rows_completed_total Rows finished so far",
+                "# TYPE llm_eval_rows_completed_total counter",
+                f"llm_eval_rows_completed_total{{{label}}} {self.completed}",
+                "# HELP llm_eval_correct_total Rows scored correct by match_answers",
+                "# TYPE llm_eval_correct_total counter",
+                f"llm_eval_correct_total{{{label}}} {self.correct}",
+                "# HELP llm_eval_errors_total Rows where the request to the model failed",
+                "# TYPE llm_eval_errors_total counter",
+                f"llm_eval_errors_total{{{label}}} {self.errors}",
+                "# HELP llm_eval_accuracy_percent Running accuracy over completed rows",
+                "# TYPE llm_eval_accuracy_percent gauge",
+                f"llm_eval_accuracy_percent{{{label}}} {self.accuracy():.2f}",
+                "# HELP llm_eval_eta_seconds Estimated seconds until the run finishes",
+                "# TYPE llm_eval_eta_seconds gauge",
+                f"llm_eval_eta_seconds{{{label}}} {self.eta_seconds():.1f}",
+                "# HELP llm_eval_last_row_timestamp_seconds Unix time of the last finished row",
+                "# TYPE llm_eval_last_row_timestamp_seconds gauge",
+                f"llm_eval_last_row_timestamp_seconds{{{label}}} {self.last_row_at or self.started_at:.3f}",
+                "# HELP llm_eval_latency_seconds Per-row model latency",
+                "# TYPE llm_eval_latency_seconds histogram",
+            ]
+            for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts):
+                lines.append(f'llm_eval_latency_seconds_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'llm_eval_latency_seconds_bucket{{{label},le="+Inf"}} {self.completed}')
+            lines.append(f"llm_eval_latency_seconds_sum{{{label}}} {self.latency_sum:.3f}")
+            lines.append(f"llm_eval_latency_seconds_count{{{label}}} {self.completed}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path: str):
+        """Write the current metrics to a file (e.g. for node_exporter's textfile collector)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        # Replace in one step so readers never see a half-written file
+        os.replace(tmp_path, path)
+
+
+def start_metrics_server(metrics: RunMetrics, port: int) -> ThreadingHTTPServer:
+    """Serve metrics.render() on http://localhost:<port>/metrics in a background thread"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep the per-row progress lines readable
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -4,11 +4,15 @@ import json
 import time
 from datetime import datetime, timezone
 import re
+from answer_matching import match_answers, start_symbolic_checker
+from live_metrics import RunMetrics, start_metrics_server, format_eta
 
 MODEL_NAME = "gemma3:4b"
 CSV_PATH = "probability_test.csv"
 OUTPUT_JSON = "results_gemma3_4b.json" #here need to change the filename whenever
 OLLAMA_URL = "http://localhost:11434/api/generate"
+METRICS_PORT = 8000  # live Prometheus metrics at http://localhost:8000/metrics, set to None to disable
+METRICS_SNAPSHOT = "metrics_gemma3_4b.prom"  # rewritten after every row, set to None to disable
 
 def extract_answer(text: str) -> str:
     if not text:
@@ -45,6 +49,18 @@ df = pd.read_csv(CSV_PATH)
 
 results = []
 
+# Fork the symbolic checker (expression datasets only) before any thread or request exists
+start_symbolic_checker(df["expected_answer"], workers=1)
+
+metrics = RunMetrics(MODEL_NAME, len(df))
+if METRICS_PORT:
+    # Instrumentation must never stop a run, e.g. when the port is already taken
+    try:
+        start_metrics_server(metrics, METRICS_PORT)
+        print(f" Live metrics: http://localhost:{METRICS_PORT}/metrics")
+    except OSError as e:
+        print(f" Warning: could not start metrics server on port {METRICS_PORT}: {e}")
+
 for idx, row in df.iterrows():
     question = row["input"]
     
@@ -73,6 +89,7 @@ A:"""
 
     start_time = time.time()
 
+    is_error = False
     try:
         response = requests.post(OLLAMA_URL, json=payload)
         response.raise_for_status()
@@ -84,6 +101,7 @@ A:"""
     except Exception as e:
         raw_answer = f"ERROR: {str(e)}"
         clean_answer = ""
+        is_error = True
 
     latency = round(time.time() - start_time, 3)
 
@@ -103,14 +121,23 @@ A:"""
 
     results.append(result)
 
-    is_correct = "✓" if clean_answer == row["expected_answer"] else "✗"
-    print(f"[{idx+1}/{len(df)}] {is_correct} | Got: {clean_answer} | Expected: {row['expected_answer']} | Time: {latency}s")
+    matched = not is_error and bool(match_answers([(clean_answer, row["expected_answer"])])[0])
+    metrics.record(latency, matched, is_error)
+    if METRICS_SNAPSHOT:
+        try:
+            metrics.write_snapshot(METRICS_SNAPSHOT)
+        except OSError as e:
+            print(f" Warning: could not write metrics snapshot: {e}")
+
+    is_correct = "✓" if matched else "✗"
+    print(f"[{idx+1}/{len(df)}] {is_correct} | Got: {clean_answer} | Expected: {row['expected_answer']} | Time: {latency}s"
+          f" | Acc: {metrics.accuracy():.1f}% | ETA: {format_eta(metrics.eta_seconds())}")
 
 with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
     json.dump(results, f, indent=2)
 
-correct = sum(1 for r in results if r["model_response"] == r["expected_answer"])
-accuracy = (correct / len(results)) * 100
+correct = metrics.correct
+accuracy = metrics.accuracy()
 
 print("\n" + "="*60)
 print(" Evaluation complete")
@@ -0,0 +1,272 @@
+import cmath
+import keyword
+import multiprocessing
+import random
+import re
+import signal
+import sys
+import threading
+from functools import lru_cache
+
+import sympy
+from sympy.parsing.sympy_parser import (
+    parse_expr,
+    standard_transformations,
+    split_symbols_custom,
+    implicit_multiplication,
+    implicit_application,
+    function_exponentiation,
+    convert_xor,
+)
+
+from answer_matching import TOLERANCE
+
+SYMBOLIC_TIMEOUT = 5.0  # seconds allowed per answer check
+PARENT_GRACE = 2.0  # extra seconds the parent waits before killing a stuck worker
+NUMERIC_TRIALS = 8  # random points tried when simplification is inconclusive
+NUMERIC_TOLERANCE = 1e-6  # relative, for expressions compared at random points
+
+# parse_expr evals its input, so only plain math text is let through:
+# letters, digits, operators, parentheses, spaces, and dots inside numbers
+ALLOWED_TEXT = re.compile(r"^[a-z0-9+\-*/^()., ]+$")
+BAD_DOT = re.compile(r"(?<![0-9])\.|\.(?![0-9])")
+IDENTIFIER = re.compile(r"[a-z]+")
+
+FUNCTIONS = {
+    "sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+    "cot": sympy.cot, "sec": sympy.sec, "csc": sympy.csc,
+    "asin": sympy.asin, "acos": sympy.acos, "atan": sympy.atan,
+    "arcsin": sympy.asin, "arccos": sympy.acos, "arctan": sympy.atan,
+    "sinh": sympy.sinh, "cosh": sympy.cosh, "tanh": sympy.tanh,
+    "exp": sympy.exp, "log": sympy.log, "ln": sympy.log,
+    "sqrt": sympy.sqrt, "abs": sympy.Abs,
+}
+
+# Function names (and pi) inside a run of letters, longest first so "sinh" wins over "sin"
+KNOWN_NAME = re.compile("|".join(sorted(list(FUNCTIONS) + ["pi"], key=len, reverse=True)))
+
+# The only names visible while parsing, with no Python builtins.
+# Input is lowercased first, so an integration constant "C" matches "c". A standalone
+# "e" or "i" is rewritten to "E" / "I" before parsing; inside a longer name such as
+# "time" they stay plain symbols.
+PARSE_GLOBALS = {
+    "__builtins__": {},
+    "Symbol": sympy.Symbol,
+    "Function": sympy.Function,
+    "Integer": sympy.Integer,
+    "Float": sympy.Float,
+    "Rational": sympy.Rational,
+    "Number": sympy.Number,
+    **FUNCTIONS,
+    "pi": sympy.pi, "oo": sympy.oo, "E": sympy.E, "I": sympy.I,
+}
+
+
+def _can_split(name: str) -> bool:
+    # Function names are separated out by _rewrite_name, never split into letters
+    return name.isalpha() and not KNOWN_NAME.search(name)
+
+
+# Allows "2xy", "x^2", "sin x" and "sinx" as well as plain Python syntax
+TRANSFORMATIONS = standard_transformations + (
+    split_symbols_custom(_can_split),
+    implicit_multiplication,
+    implicit_application,
+    function_exponentiation,
+    convert_xor,
+)
+
+DEGENERATE = (sympy.nan, sympy.zoo)
+
+
+_pool = None
+_result_cache = {}
+_warned_in_process = False
+
+
+class CheckTimeout(BaseException):
+    # Not an Exception, so SymPy's own "except Exception" blocks cannot swallow it
+    pass
+
+
+def is_safe_expression(expr_str: str) -> bool:
+    """Check that text is a plain math expression before it is parsed"""
+    if not ALLOWED_TEXT.match(expr_str) or BAD_DOT.search(expr_str):
+        return False
+    return not any(keyword.iskeyword(name) for name in IDENTIFIER.findall(expr_str))
+
+
+def _rewrite_name(match) -> str:
+    """Separate function names inside a run of letters, e.g. "sinx" -> "sin x", "xcos" -> "x cos" """
+    name = match.group(0)
+    if name in ("e", "i"):
+        return name.upper()
+    if name in PARSE_GLOBALS:
+        return name
+    parts = []
+    pos = 0
+    for known in KNOWN_NAME.finditer(name):
+        parts += [name[pos:known.start()], known.group(0)]
+        pos = known.end()
+    parts.append(name[pos:])
+    # A leftover single "e" or "i" next to a function name is still a constant, e.g. "lne"
+    return " ".join(part.upper() if part in ("e", "i") else part for part in parts if part)
+
+
+@lru_cache(maxsize=4096)
+def canonicalize(expr_str: str):
+    """Parse and simplify an expression, cached by its string"""
+    expr_str = expr_str.strip().lower()
+    if not is_safe_expression(expr_str):
+        raise ValueError(f"not a plain math expression: {expr_str!r}")
+    expr_str = IDENTIFIER.sub(_rewrite_name, expr_str)
+    expr = parse_expr(expr_str, local_dict={}, global_dict=dict(PARSE_GLOBALS),
+                      transformations=TRANSFORMATIONS, evaluate=True)
+    return sympy.simplify(expr)
+
+
+def is_degenerate(expr) -> bool:
+    """nan/zoo are never a valid answer, and infinity only on its own (e.g. a limit)"""
+    if not isinstance(expr, sympy.Basic) or expr.has(*DEGENERATE):
+        return True
+    return expr.has(sympy.oo) and expr not in (sympy.oo, -sympy.oo)
+
+
+def numerically_equal(a, b) -> bool:
+    """Compare two expressions at random points for their free symbols"""
+    symbols = sorted(a.free_symbols | b.free_symbols, key=str)
+    agreed = 0
+    for _ in range(NUMERIC_TRIALS * 3):
+        point = {s: random.uniform(-3, 3) for s in symbols}
+        try:
+            a_val = complex(a.evalf(subs=point))
+            b_val = complex(b.evalf(subs=point))
+        except (TypeError, ValueError, ZeroDivisionError):
+            # Outside the domain of one of the expressions, try another point
+            continue
+        if not (cmath.isfinite(a_val) and cmath.isfinite(b_val)):
+            continue
+        if abs(a_val - b_val) > NUMERIC_TOLERANCE * max(1.0, abs(b_val)):
+            return False
+        agreed += 1
+        if agreed >= NUMERIC_TRIALS:
+            return True
+    return False
+
+
+def expressions_equivalent(model_answer: str, expected_answer: str) -> bool:
+    """Check if two answer expressions are mathematically equivalent"""
+    try:
+        model_expr = canonicalize(model_answer)
+        expected_expr = canonicalize(expected_answer)
+    except Exception:
+        # Model output that is not a valid expression
+        return False
+
+    if is_degenerate(model_expr) or is_degenerate(expected_expr):
+        return False
+
+    if model_expr == expected_expr:
+        return True
+
+    # Plain values such as pi/4 vs 0.785 use the same tolerance as answers_match
+    if not model_expr.free_symbols and not expected_expr.free_symbols:
+        try:
+            return abs(complex(model_expr.evalf()) - complex(expected_expr.evalf())) < TOLERANCE
+        except (TypeError, ValueError):
+            return False
+
+    try:
+        if sympy.simplify(model_expr - expected_expr) == 0:
+            return True
+    except TypeError:
+        pass
+
+    # Simplification can miss identities, fall back to random evaluation
+    return numerically_equal(model_expr, expected_expr)
+
+
+def _raise_timeout(signum, frame):
+    raise CheckTimeout()
+
+
+def _check_pair(pair):
+    """Worker entry point, returns None if the check ran out of time"""
+    model_answer, expected_answer, timeout = pair
+    # Alarms can only be set from the main thread
+    use_alarm = hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return expressions_equivalent(model_answer, expected_answer)
+    except CheckTimeout:
+        return None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _can_fork() -> bool:
+    """Forking is only safe before other threads start; on macOS also not after network use"""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return False
+    return threading.active_count() == 1 and sys.platform != "darwin"
+
+
+def start_pool(workers: int = None):
+    """Fork the worker pool now, before the caller starts threads or makes network requests"""
+    global _pool
+    if _pool is None and "fork" in multiprocessing.get_all_start_methods():
+        _pool = multiprocessing.get_context("fork").Pool(workers)
+    return _pool
+
+
+def _kill_pool():
+    global _pool
+    _pool.terminate()
+    _pool.join()
+    _pool = None
+
+
+def check_answers(pairs, timeout: float = SYMBOLIC_TIMEOUT, workers: int = None) -> list:
+    """Check (model_answer, expected_answer) pairs in a process pool.
+
+    The pool is created on first use and reused across calls, so each worker keeps its
+    canonicalize cache; workers is only used when the pool is created. Results are also
+    cached here by pair. Returns one entry per pair: True, False, or None when the check
+    timed out.
+    """
+    global _warned_in_process
+    pairs = [(str(model_ans), str(expected_ans)) for model_ans, expected_ans in pairs]
+    todo = list(dict.fromkeys(pair for pair in pairs if pair not in _result_cache))
+
+    while todo:
+        if _pool is None and _can_fork():
+            start_pool(workers)
+        if _pool is None:
+            if not _warned_in_process:
+                print(" Warning: cannot fork a process pool here, symbolic checks run "
+                      "in-process and only stop at the timeout where SIGALRM is available")
+                _warned_in_process = True
+            for model_ans, expected_ans in todo:
+                _result_cache[(model_ans, expected_ans)] = _check_pair((model_ans, expected_ans, timeout))
+            break
+
+        # Tasks are handed out in order, so each one starts by the time the earlier ones are
+        # collected and gets its own timeout. A worker that ignores the alarm (e.g. stuck in
+        # C code) is killed with the pool, and the remaining pairs go to a fresh pool.
+        pending = [_pool.apply_async(_check_pair, (pair + (timeout,),)) for pair in todo]
+        for pair, async_result in zip(list(todo), pending):
+            try:
+                _result_cache[pair] = async_result.get(timeout=timeout + PARENT_GRACE)
+            except multiprocessing.TimeoutError:
+                _result_cache[pair] = None
+                _kill_pool()
+                break
+            except Exception:
+                _result_cache[pair] = False
+            finally:
+                todo.remove(pair)
+
+    return [_result_cache[pair] for pair in pairs]
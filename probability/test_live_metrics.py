@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from live_metrics import LATENCY_BUCKETS, RunMetrics, format_eta
+
+METRIC_NAMES = [
+    "llm_eval_dataset_rows",
+    "llm_eval_rows_completed_total",
+    "llm_eval_correct_total",
+    "llm_eval_errors_total",
+    "llm_eval_accuracy_percent",
+    "llm_eval_eta_seconds",
+    "llm_eval_last_row_timestamp_seconds",
+    "llm_eval_latency_seconds_sum",
+    "llm_eval_latency_seconds_count",
+]
+
+
+def sample(text, name, le=None):
+    """Value of one sample line in the rendered output"""
+    labels = r'\{model="m"' + (rf',le="{re.escape(le)}"' if le else "") + r"\}"
+    matches = re.findall(rf"^{name}{labels} (\S+)$", text, re.MULTILINE)
+    assert len(matches) == 1, f"{name} le={le} appears {len(matches)} times"
+    return float(matches[0])
+
+
+@pytest.fixture
+def metrics():
+    m = RunMetrics("m", 10)
+    m.record(0.1, is_correct=True, is_error=False)
+    m.record(0.7, is_correct=False, is_error=False)
+    m.record(3.0, is_correct=True, is_error=True)
+    m.record(120.0, is_correct=True, is_error=False)
+    return m
+
+
+def test_errors_count_as_completed_but_not_correct(metrics):
+    assert metrics.completed == 4
+    assert metrics.errors == 1
+    assert metrics.correct == 2
+    assert metrics.accuracy() == 50
+
+
+def test_histogram_buckets_are_cumulative(metrics):
+    text = metrics.render()
+    counts = [sample(text, "llm_eval_latency_seconds_bucket", str(b)) for b in LATENCY_BUCKETS]
+    assert counts == sorted(counts)
+    assert sample(text, "llm_eval_latency_seconds_bucket", "0.25") == 1
+    assert sample(text, "llm_eval_latency_seconds_bucket", "1.0") == 2
+    assert sample(text, "llm_eval_latency_seconds_bucket", "60.0") == 3
+    assert sample(text, "llm_eval_latency_seconds_bucket", "+Inf") == sample(text, "llm_eval_latency_seconds_count") == 4
+    assert sample(text, "llm_eval_latency_seconds_sum") == pytest.approx(123.8)
+
+
+def test_render_contains_each_metric_once(metrics):
+    text = metrics.render()
+    for name in METRIC_NAMES:
+        sample(text, name)
+    for name in ["llm_eval_dataset_rows", "llm_eval_accuracy_percent", "llm_eval_latency_seconds"]:
+        assert text.count(f"# TYPE {name} ") == 1
+        assert text.count(f"# HELP {name} ") == 1
+
+
+def test_eta():
+    m = RunMetrics("m", 10)
+    assert m.eta_seconds() == 0
+
+    # Four rows in 8 seconds leaves six rows at 2 seconds each
+    m.started_at = 1000.0
+    for _ in range(4):
+        m.record(1.0, is_correct=True, is_error=False)
+    m.last_row_at = 1008.0
+    assert m.eta_seconds() == pytest.approx(12.0)
+    assert format_eta(m.eta_seconds()) == "0:00:12"
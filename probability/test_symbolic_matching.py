@@ -0,0 +1,112 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("sympy")
+
+from answer_matching import match_answers
+import symbolic_matching
+from symbolic_matching import check_answers, expressions_equivalent
+
+EQUIVALENT = [
+    ("2x*cos(x^2)", "cos(x**2)*2*x"),
+    ("sin(x)^2 + cos(x)^2", "1"),
+    ("exp(x)", "e^x"),
+    ("x^2/2 + c", "x**2/2 + C"),
+    ("ln(x)", "log(x)"),
+    ("sec(x)", "1/cos(x)"),
+    ("2.5x", "5x/2"),
+    ("e^(i*pi)", "-1"),
+    ("oo", "oo"),
+    # Shorthand without parentheses
+    ("sinx", "sin(x)"),
+    ("lnx", "log(x)"),
+    ("2xcos(x^2)", "2*x*cos(x**2)"),
+    ("xy", "x*y"),
+    # Multi-letter names are products of plain symbols
+    ("time", "emit"),
+    # Decimal approximations of closed forms, within the same 0.005 as answers_match
+    ("0.785", "pi/4"),
+    ("pi/4", "0.7854"),
+    ("1.414", "sqrt(2)"),
+]
+
+NOT_EQUIVALENT = [
+    ("x + 1", "x + 2"),
+    ("sqrt(x^2)", "x"),
+    ("x^2/2", "x^2/2 + c"),
+    ("oo", "x"),
+    ("te", "t*exp(1)"),
+    ("rate", "time"),
+    ("0.78", "pi/4"),
+    # Degenerate answers must not match anything
+    ("nan", "x"),
+    ("0/0", "x + 1"),
+    ("1/0", "x"),
+    ("zoo", "x"),
+    ("x + oo", "x + oo"),
+    # Not an expression
+    ("abc(", "x"),
+    ("", "x"),
+]
+
+
+@pytest.mark.parametrize("model_answer, expected_answer", EQUIVALENT)
+def test_equivalent(model_answer, expected_answer):
+    assert expressions_equivalent(model_answer, expected_answer)
+
+
+@pytest.mark.parametrize("model_answer, expected_answer", NOT_EQUIVALENT)
+def test_not_equivalent(model_answer, expected_answer):
+    assert not expressions_equivalent(model_answer, expected_answer)
+
+
+@pytest.mark.parametrize("model_answer", [
+    "__import__('os').system('touch {path}')",
+    "x.__class__.__base__",
+    "lambda x: x",
+    "open('{path}', 'w')",
+])
+def test_model_output_is_never_executed(tmp_path, model_answer):
+    path = tmp_path / "pwned"
+    assert check_answers([(model_answer.format(path=path), "x")]) == [False]
+    assert not os.path.exists(path)
+
+
+def test_pool_keeps_order_and_times_out():
+    # 9^9^9^9 can never be evaluated, so the check has to be cut off
+    assert check_answers([("x + x", "2x"), ("9^9^9^9", "x"), ("x", "y")], timeout=1) == [True, None, False]
+
+
+def test_results_are_cached_across_calls():
+    pair = ("3x + 3x", "6x")
+    check_answers([pair])
+    assert symbolic_matching._result_cache[pair] is True
+    symbolic_matching._result_cache[pair] = "cached"
+    assert check_answers([pair, pair]) == ["cached", "cached"]
+    del symbolic_matching._result_cache[pair]
+
+
+def test_no_fork_while_other_threads_run(monkeypatch):
+    monkeypatch.setattr(symbolic_matching, "_pool", None)
+    monkeypatch.setattr(symbolic_matching, "start_pool", lambda workers=None: pytest.fail("forked"))
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        assert check_answers([("4x + 4x", "8x")]) == [True]
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_match_answers_mixes_numeric_and_symbolic():
+    assert match_answers([
+        ("0.167", "1/6"),
+        ("2", "1/6"),
+        ("e^x", "exp(x)"),
+        ("1/0", "2x"),
+        ("pi/4", "0.785"),
+        ("sqrt(2)", "1.414"),
+    ]) == [True, False, True, False, True, True]